@@ -1,8 +1,14 @@
-from copy import copy
+import heapq
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
 
 from misc.log import logger
 
 log = logger.get_logger(__name__)
+thread_data = threading.local()
 
 
 def get_response_dict(response, key_field=None, key_value=None):
@@ -30,6 +36,13 @@ def get_response_dict(response, key_field=None, key_value=None):
     return found_response
 
 
+def get_thread_session():
+    # requests sessions are not thread safe, so each thread gets its own
+    if not hasattr(thread_data, 'session'):
+        thread_data.session = requests.Session()
+    return thread_data.session
+
+
 def backoff_handler(details):
     log.warning("Backing off {wait:0.1f} seconds afters {tries} tries "
                 "calling function {target} with args {args} and kwargs "
@@ -68,18 +81,38 @@ def allowed_genres(genres, object_type, trakt_object):
     return allowed_object
 
 
-def sorted_list(original_list, list_type, sort_key, reverse=True):
-    prepared_list = copy(original_list)
-    for item in prepared_list:
-        if not item[list_type][sort_key]:
-            if sort_key == 'released' or sort_key == 'first_aired':
-                item[list_type][sort_key] = ""
-            else:
-                item[list_type][sort_key] = 0
+def sorted_list(original_list, list_type, sort_key, reverse=True, batch_size=25):
+    empty_value = "" if sort_key == 'released' or sort_key == 'first_aired' else 0
 
-    return sorted(prepared_list, key=lambda k: k[list_type][sort_key], reverse=reverse)
+    def sort_value(item):
+        return item[list_type][sort_key] or empty_value
+
+    # select items in growing batches so callers that stop early (e.g. add_limit) never pay for a full sort
+    select = heapq.nlargest if reverse else heapq.nsmallest
+    selected = 0
+    while selected < len(original_list):
+        batch = select(selected + batch_size, original_list, key=sort_value)
+        for item in batch[selected:]:
+            yield item
+        selected = len(batch)
+        batch_size *= 2
 
 
 # reference: https://stackoverflow.com/a/16712886
 def substring_after(s, delim):
     return s.partition(delim)[2]
+
+
+def threaded_lookahead(func, items, workers=4):
+    # yield (item, func(item)) in order, while func already runs for the next few items on a thread pool
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for item in items:
+            pending.append((item, executor.submit(func, item)))
+            if len(pending) > workers:
+                next_item, future = pending.popleft()
+                yield next_item, future.result()
+
+        while pending:
+            next_item, future = pending.popleft()
+            yield next_item, future.result()
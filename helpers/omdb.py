@@ -1,6 +1,6 @@
+from helpers.misc import get_thread_session
 from misc.log import logger
 import json
-import requests
 
 log = logger.get_logger(__name__)
 
@@ -23,7 +23,7 @@ def get_movie_rt_score(omdb_api_key, movie_title, movie_year, movie_imdb_id):
                   movie_title,
                   movie_year,
                   movie_imdb_id)
-        r = requests.get('http://www.omdbapi.com/?i=' + movie_imdb_id + '&apikey=' + omdb_api_key)
+        r = get_thread_session().get('http://www.omdbapi.com/?i=' + movie_imdb_id + '&apikey=' + omdb_api_key)
         if r.status_code == 200 and json.loads(r.text)["Response"] == 'True':
             log.debug("Successfully requested ratings from OMDB for \'%s (%s)\' [IMDb ID: %s]",
                       movie_title,
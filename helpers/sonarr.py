@@ -34,34 +34,17 @@ def readable_tag_from_ids(profile_tag_ids, chosen_tag_ids):
     return None
 
 
-def filter_trakt_series_list(trakt_series, callback):
-    new_series_list = []
-    try:
-        for tmp in trakt_series:
-            if 'show' not in tmp or 'ids' not in tmp['show'] or 'tvdb' not in tmp['show']['ids']:
-                log.debug("Removing shows from Trakt list as it did not have the required fields: %s", tmp)
-                if callback:
-                    callback('movie', tmp)
-                continue
-            new_series_list.append(tmp)
-
-        return new_series_list
-    except Exception:
-        log.exception("Exception filtering Trakt shows list: ")
-    return None
-
-
-def series_to_tvdb_dict(sonarr_series):
-    series = {}
+def series_to_tvdb_set(sonarr_series):
+    series = set()
     try:
         for tmp in sonarr_series:
             if 'tvdbId' not in tmp:
                 log.debug("Could not handle show: %s", tmp['title'])
                 continue
-            series[tmp['tvdbId']] = tmp
+            series.add(tmp['tvdbId'])
         return series
     except Exception:
-        log.exception("Exception processing Sonarr shows to TVDB dict: ")
+        log.exception("Exception processing Sonarr shows to TVDB set: ")
     return None
 
 
@@ -73,18 +56,21 @@ def remove_existing_series(sonarr_series, trakt_series, callback=None):
         return None
 
     try:
-        # clean up trakt_series list
-        trakt_series = filter_trakt_series_list(trakt_series, callback)
-        if not trakt_series:
-            return None
-
-        # turn sonarr series result into a dict with tvdb id as keys
-        processed_series = series_to_tvdb_dict(sonarr_series)
+        # turn sonarr series result into a set of tvdb ids
+        processed_series = series_to_tvdb_set(sonarr_series)
         if not processed_series:
             return None
 
-        # loop list adding to series that do not already exist
+        # clean up trakt_series list and remove series that already exist in a single pass
+        valid_series = 0
         for tmp in trakt_series:
+            if 'show' not in tmp or 'ids' not in tmp['show'] or 'tvdb' not in tmp['show']['ids']:
+                log.debug("Removing shows from Trakt list as it did not have the required fields: %s", tmp)
+                if callback:
+                    callback('movie', tmp)
+                continue
+            valid_series += 1
+
             # check if show exists in processed_series
             if tmp['show']['ids']['tvdb'] in processed_series:
                 show_year = str(tmp['show']['year']) if tmp['show']['year'] else '????'
@@ -95,7 +81,10 @@ def remove_existing_series(sonarr_series, trakt_series, callback=None):
 
             new_series_list.append(tmp)
 
-        series_removed = len(trakt_series) - len(new_series_list)
+        if not valid_series:
+            return None
+
+        series_removed = valid_series - len(new_series_list)
         log.debug("Filtered %d shows from Trakt list that were already in Sonarr.", series_removed)
         log.debug("New Trakt shows list count: %d", len(new_series_list))
         return new_series_list
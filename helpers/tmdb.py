@@ -1,5 +1,5 @@
+from helpers.misc import get_thread_session
 from misc.log import logger
-import requests
 
 log = logger.get_logger(__name__)
 
@@ -18,7 +18,7 @@ def validate_movie_tmdb_id(movie_title, movie_year, movie_tmdb_id):
 
 def verify_movie_exists_on_tmdb(movie_title, movie_year, movie_tmdb_id):
     try:
-        req = requests.get('https://www.themoviedb.org/movie/%s' % movie_tmdb_id)
+        req = get_thread_session().get('https://www.themoviedb.org/movie/%s' % movie_tmdb_id)
         if req.status_code == 200:
             log.debug("\'%s (%s)\' [TMDb ID: %s] exists on TMDb.", movie_title, movie_year, movie_tmdb_id)
             return True
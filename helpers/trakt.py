@@ -1,3 +1,5 @@
+from types import SimpleNamespace
+
 from helpers import str as misc_str
 from misc.log import logger
 
@@ -16,9 +18,20 @@ def extract_list_user_and_key_from_url(list_url):
     exit()
 
 
+def compile_blacklist_settings(blacklist_settings):
+    # prepare blacklist settings once per list, rather than for every show / movie checked against them
+    settings = {}
+    for key, value in blacklist_settings.items():
+        if key.endswith('_ids'):
+            value = frozenset(map(int, value))
+        elif isinstance(value, list):
+            value = [item.lower() if isinstance(item, str) else item for item in value]
+        settings[key] = value
+    return SimpleNamespace(**settings)
+
+
 def blacklisted_show_id(show, blacklisted_ids):
     blacklisted = False
-    blacklisted_ids = sorted(map(int, blacklisted_ids))
     try:
         if show['show']['ids']['tvdb'] in blacklisted_ids:
             log.debug("\'%s\' | Blacklisted IDs Check        | Blacklisted because it had a blacklisted TVDB ID: %d",
@@ -40,7 +53,7 @@ def blacklisted_show_title(show, blacklisted_keywords):
             blacklisted = True
         else:
             for keyword in blacklisted_keywords:
-                if keyword.lower() in show['show']['title'].lower():
+                if keyword in show['show']['title'].lower():
                     log.debug("\'%s\' | Blacklisted Titles Check     | Blacklisted because it had the title keyword: %s",
                               show['show']['title'], keyword)
                     blacklisted = True
@@ -80,7 +93,7 @@ def blacklisted_show_network(show, networks):
             blacklisted = True
         else:
             for network in networks:
-                if network.lower() in show['show']['network'].lower():
+                if network in show['show']['network'].lower():
                     log.debug("\'%s\' | Blacklisted Networks Check   | Blacklisted because it's from the network: %s",
                               show['show']['title'], show['show']['network'])
                     blacklisted = True
@@ -96,7 +109,7 @@ def blacklisted_show_country(show, allowed_countries):
     blacklisted = False
     try:
         # ["ignore"] - add show item even if it is missing a country
-        if any('ignore' in s.lower() for s in allowed_countries):
+        if any('ignore' in s for s in allowed_countries):
             log.debug("\'%s\' | Blacklisted Countries Check  | Ignored.", show['show']['title'])
         # List provided - skip adding show item because it is missing a country
         elif not show['show']['country']:
@@ -108,7 +121,7 @@ def blacklisted_show_country(show, allowed_countries):
             log.debug("\'%s\' | Blacklisted Countries Check  | Skipped.",
                       show['show']['title'])
         # List provided - skip adding show item if the country is blacklisted
-        elif not any(show['show']['country'].lower() in s.lower() for s in allowed_countries):
+        elif not any(show['show']['country'].lower() in s for s in allowed_countries):
             log.debug("\'%s\' | Blacklisted Countries Check  | Blacklisted because it's from the country: %s",
                       show['show']['title'],
                       show['show']['country'].upper())
@@ -127,7 +140,7 @@ def blacklisted_show_language(show, allowed_languages):
         allowed_languages = ['en']
     try:
         # ["ignore"] - add show item even if it is missing a language
-        if any('ignore' in s.lower() for s in allowed_languages):
+        if any('ignore' in s for s in allowed_languages):
             log.debug("\'%s\' | Blacklisted Languages Check  | Ignored.", show['show']['title'])
         # List provided - skip adding show item because it is missing a language
         elif not show['show']['language']:
@@ -135,7 +148,7 @@ def blacklisted_show_language(show, allowed_languages):
                       show['show']['title'])
             blacklisted = True
         # List provided - skip adding show item if the language is blacklisted
-        elif not any(show['show']['language'].lower() in c.lower() for c in allowed_languages):
+        elif not any(show['show']['language'].lower() in c for c in allowed_languages):
             log.debug("\'%s\' | Blacklisted Languages Check  | Blacklisted because it's in the language: %s",
                       show['show']['title'], show['show']['language'].upper())
             blacklisted = True
@@ -150,7 +163,7 @@ def blacklisted_show_genre(show, genres):
     blacklisted = False
     try:
         # ["ignore"] - add show item even if it is missing a genre
-        if any('ignore' in s.lower() for s in genres):
+        if any('ignore' in s for s in genres):
             log.debug("\'%s\' | Blacklisted Genres Check     | Ignored.", show['show']['title'])
         elif not show['show']['genres']:
             log.debug("\'%s\' | Blacklisted Genres Check     | Blacklisted because it had no genre specified.",
@@ -163,7 +176,7 @@ def blacklisted_show_genre(show, genres):
         # List provided - skip adding show item if the genre is blacklisted
         else:
             for genre in genres:
-                if genre.lower() in show['show']['genres']:
+                if genre in show['show']['genres']:
                     log.debug("\'%s\' | Blacklisted Genres Check     | Blacklisted because it was from the genre: %s",
                               show['show']['title'], genre.title())
                     blacklisted = True
@@ -225,7 +238,6 @@ def is_show_blacklisted(show, blacklist_settings, ignore_blacklist, callback=Non
 
 def blacklisted_movie_id(movie, blacklisted_ids):
     blacklisted = False
-    blacklisted_ids = sorted(map(int, blacklisted_ids))
     try:
         if movie['movie']['ids']['tmdb'] in blacklisted_ids:
             log.debug("\'%s\' | Blacklisted IDs Check        | Blacklisted because it had a blacklisted TMDb ID: %d",
@@ -246,7 +258,7 @@ def blacklisted_movie_title(movie, blacklisted_keywords):
             blacklisted = True
         else:
             for keyword in blacklisted_keywords:
-                if keyword.lower() in movie['movie']['title'].lower():
+                if keyword in movie['movie']['title'].lower():
                     log.debug("\'%s\' | Blacklisted Titles Check     | Blacklisted because it had the title keyword: %s",
                               movie['movie']['title'], keyword)
                     blacklisted = True
@@ -282,7 +294,7 @@ def blacklisted_movie_country(movie, allowed_countries):
     blacklisted = False
     try:
         # ["ignore"] - add movie item even if it is missing a country
-        if any('ignore' in s.lower() for s in allowed_countries):
+        if any('ignore' in s for s in allowed_countries):
             log.debug("\'%s\' | Blacklisted Countries Check  | Ignored.",
                       movie['movie']['title'])
         # List provided - skip adding movie item because it is missing a country
@@ -295,7 +307,7 @@ def blacklisted_movie_country(movie, allowed_countries):
             log.debug("\'%s\' | Blacklisted Countries Check  | Skipped.",
                       movie['movie']['title'])
         # List provided - skip adding movie item if the country is blacklisted
-        elif not any(movie['movie']['country'].lower() in s.lower() for s in allowed_countries):
+        elif not any(movie['movie']['country'].lower() in s for s in allowed_countries):
             log.debug("\'%s\' | Blacklisted Countries Check  | Blacklisted because it's from the country: %s",
                       movie['movie']['title'], movie['movie']['country'].upper())
             blacklisted = True
@@ -313,7 +325,7 @@ def blacklisted_movie_language(movie, allowed_languages):
         allowed_languages = ['en']
     try:
         # ["ignore"] - add movie item even if it is missing a language
-        if any('ignore' in s.lower() for s in allowed_languages):
+        if any('ignore' in s for s in allowed_languages):
             log.debug("\'%s\' | Blacklisted Languages Check  | Ignored.",
                       movie['movie']['title'])
         # List provided - skip adding movie item because it is missing a language
@@ -322,7 +334,7 @@ def blacklisted_movie_language(movie, allowed_languages):
                       movie['movie']['title'])
             blacklisted = True
         # List provided - skip adding movie item if the language is blacklisted
-        elif not any(movie['movie']['language'].lower() in s.lower() for s in allowed_languages):
+        elif not any(movie['movie']['language'].lower() in s for s in allowed_languages):
             log.debug("\'%s\' | Blacklisted Languages Check  | Blacklisted because it's in the language: %s",
                       movie['movie']['title'], movie['movie']['language'].upper())
             blacklisted = True
@@ -337,7 +349,7 @@ def blacklisted_movie_genre(movie, genres):
     blacklisted = False
     try:
         # ["ignore"] - add movie item even if it is missing a genre
-        if any('ignore' in s.lower() for s in genres):
+        if any('ignore' in s for s in genres):
             log.debug("\'%s\' | Blacklisted Genres Check     | Ignored.", movie['movie']['title'])
         elif not movie['movie']['genres']:
             log.debug("\'%s\' | Blacklisted Genres Check     | Blacklisted because it had no genre specified.",
@@ -350,7 +362,7 @@ def blacklisted_movie_genre(movie, genres):
         # List provided - skip adding movie item if the genre is blacklisted
         else:
             for genre in genres:
-                if genre.lower() in movie['movie']['genres']:
+                if genre in movie['movie']['genres']:
                     log.debug("\'%s\' | Blacklisted Genres Check     | Blacklisted because it was from the genre: %s",
                               movie['movie']['title'], genre.title())
                     blacklisted = True
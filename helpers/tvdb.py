@@ -1,5 +1,5 @@
+from helpers.misc import get_thread_session
 from misc.log import logger
-import requests
 
 log = logger.get_logger(__name__)
 
@@ -18,7 +18,8 @@ def validate_series_tvdb_id(series_title, series_year, series_tvdb_id):
 
 def verify_series_exists_on_tvdb(series_title, series_year, series_tvdb_id):
     try:
-        req = requests.get('https://www.thetvdb.com/dereferrer/series/%s' % series_tvdb_id, allow_redirects=False)
+        req = get_thread_session().get('https://www.thetvdb.com/dereferrer/series/%s' % series_tvdb_id,
+                                       allow_redirects=False)
         if 'This record has either been deleted or has never existed.' not in req.text:
             log.debug("\'%s (%s)\' [TVDB ID: %s] exists on TVDB.", series_title, series_year, series_tvdb_id)
             return True
@@ -1,4 +1,5 @@
 import os.path
+import time
 from abc import ABC, abstractmethod
 from distutils.version import LooseVersion as Version
 
@@ -14,6 +15,11 @@ log = logger.get_logger(__name__)
 
 
 class PVR(ABC):
+    # seconds before the library retrieved by get_library is retrieved again
+    library_ttl = 60 * 60
+    # seconds before cached tags, profile ids and server version are retrieved again
+    response_ttl = 60 * 60
+
     def __init__(self, server_url, api_key):
         self.server_url = server_url
         self.api_key = api_key
@@ -21,13 +27,17 @@ class PVR(ABC):
             'Content-Type': 'application/json',
             'X-Api-Key': self.api_key,
         }
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.library = None
+        self.library_expires = 0
+        self.responses = {}
 
     def validate_api_key(self):
         try:
             # request system status to validate api_key
-            req = requests.get(
+            req = self.session.get(
                 os.path.join(misc_str.ensure_endswith(self.server_url, "/"), 'api/system/status'),
-                headers=self.headers,
                 timeout=60,
                 allow_redirects=False
             )
@@ -44,13 +54,35 @@ class PVR(ABC):
     def get_objects(self):
         pass
 
+    def get_library(self):
+        # reuse the retrieved library until it expires, objects added in the meantime are appended to it
+        if self.library is None or time.time() >= self.library_expires:
+            library = self.get_objects()
+            if library is None:
+                return None
+
+            self.library = library
+            self.library_expires = time.time() + self.library_ttl
+        else:
+            log.debug("Using previously retrieved library, objects found: %d", len(self.library))
+        return self.library
+
+    def _get_cached_response(self, key):
+        cached = self.responses.get(key)
+        if cached is None or time.time() >= cached[0]:
+            return None
+        log.debug("Using cached response for %s", key)
+        return cached[1]
+
+    def _set_cached_response(self, key, value):
+        self.responses[key] = (time.time() + self.response_ttl, value)
+
     @backoff.on_predicate(backoff.expo, lambda x: x is None, max_tries=4, on_backoff=backoff_handler)
     def _get_objects(self, endpoint):
         try:
             # make request
-            req = requests.get(
+            req = self.session.get(
                 os.path.join(misc_str.ensure_endswith(self.server_url, "/"), endpoint),
-                headers=self.headers,
                 timeout=60,
                 allow_redirects=False
             )
@@ -69,11 +101,15 @@ class PVR(ABC):
 
     @backoff.on_predicate(backoff.expo, lambda x: x is None, max_tries=4, on_backoff=backoff_handler)
     def get_quality_profile_id(self, profile_name):
+        cache_key = ('quality_profile_id', profile_name.lower())
+        profile_id = self._get_cached_response(cache_key)
+        if profile_id is not None:
+            return profile_id
+
         try:
             # make request
-            req = requests.get(
+            req = self.session.get(
                 os.path.join(misc_str.ensure_endswith(self.server_url, "/"), 'api/profile'),
-                headers=self.headers,
                 timeout=60,
                 allow_redirects=False
             )
@@ -85,6 +121,7 @@ class PVR(ABC):
                 for profile in resp_json:
                     if profile['name'].lower() == profile_name.lower():
                         log.debug("Found Quality Profile ID for \'%s\': %d", profile_name, profile['id'])
+                        self._set_cached_response(cache_key, profile['id'])
                         return profile['id']
                     log.debug("Profile \'%s\' with ID \'%d\' did not match Quality Profile \'%s\'", profile['name'],
                               profile['id'], profile_name)
@@ -96,23 +133,29 @@ class PVR(ABC):
 
     @backoff.on_exception(backoff.expo, requests.exceptions.RequestException, max_tries=4, on_backoff=backoff_handler)
     def get_language_profile_id(self, language_name):
+        cache_key = ('language_profile_id', language_name.lower())
+        profile_id = self._get_cached_response(cache_key)
+        if profile_id is not None:
+            return profile_id
+
         try:
             # check if sonarr is v3
-
-            # make request
-            ver_req = requests.get(
-                os.path.join(misc_str.ensure_endswith(self.server_url, "/"), 'api/system/status'),
-                headers=self.headers,
-                timeout=60,
-                allow_redirects=False
-            )
-
-            if ver_req.status_code == 200:
-                ver_resp_json = ver_req.json()
-                if not Version(ver_resp_json['version']) > Version('3'):
-                    log.debug("Skipping Language Profile lookup because Sonarr version is \'%s\'.",
-                              ver_resp_json['version'])
-                    return None
+            version = self._get_cached_response('version')
+            if version is None:
+                # make request
+                ver_req = self.session.get(
+                    os.path.join(misc_str.ensure_endswith(self.server_url, "/"), 'api/system/status'),
+                    timeout=60,
+                    allow_redirects=False
+                )
+
+                if ver_req.status_code == 200:
+                    version = ver_req.json()['version']
+                    self._set_cached_response('version', version)
+
+            if version is not None and not Version(version) > Version('3'):
+                log.debug("Skipping Language Profile lookup because Sonarr version is \'%s\'.", version)
+                return None
 
         except Exception:
             log.exception("Exception verifying Sonarr version.")
@@ -120,9 +163,8 @@ class PVR(ABC):
 
         try:
             # make request
-            req = requests.get(
+            req = self.session.get(
                 os.path.join(misc_str.ensure_endswith(self.server_url, "/"), 'api/v3/languageprofile'),
-                headers=self.headers,
                 timeout=60,
                 allow_redirects=False
             )
@@ -134,6 +176,7 @@ class PVR(ABC):
                 for profile in resp_json:
                     if profile['name'].lower() == language_name.lower():
                         log.debug("Found Language Profile ID for \'%s\': %d", language_name, profile['id'])
+                        self._set_cached_response(cache_key, profile['id'])
                         return profile['id']
                     log.debug("Profile \'%s\' with ID \'%d\' did not match Language Profile \'%s\'", profile['name'],
                               profile['id'], language_name)
@@ -161,9 +204,8 @@ class PVR(ABC):
     def _add_object(self, endpoint, payload, identifier_field, identifier):
         try:
             # make request
-            req = requests.post(
+            req = self.session.post(
                 os.path.join(misc_str.ensure_endswith(self.server_url, "/"), endpoint),
-                headers=self.headers,
                 json=payload,
                 timeout=60,
                 allow_redirects=False
@@ -181,7 +223,9 @@ class PVR(ABC):
                     and (response_json and identifier_field in response_json) \
                     and response_json[identifier_field] == identifier:
                 log.debug("Successfully added: \'%s [%d]\'", payload['title'], identifier)
-                return True
+                if self.library is not None:
+                    self.library.append(response_json)
+                return response_json
             elif response_json and ('errorMessage' in response_json or 'message' in response_json):
                 message = response_json['errorMessage'] if 'errorMessage' in response_json else response_json['message']
 
@@ -1,5 +1,8 @@
+import os.path
+
 import backoff
 
+from helpers import str as misc_str
 from helpers.misc import backoff_handler, dict_merge
 from media.pvr import PVR
 from misc.log import logger
@@ -39,3 +42,33 @@ class Radarr(PVR):
         })
 
         return self._add_object('api/movie', payload, identifier_field='tmdbId', identifier=movie_tmdb_id)
+
+    @backoff.on_predicate(backoff.expo, lambda x: x is None, max_tries=4, on_backoff=backoff_handler)
+    def search_movies(self, movie_ids):
+        payload = {
+            'name': 'MoviesSearch',
+            'movieIds': movie_ids,
+        }
+
+        try:
+            # make request
+            req = self.session.post(
+                os.path.join(misc_str.ensure_endswith(self.server_url, "/"), 'api/command'),
+                json=payload,
+                timeout=60,
+                allow_redirects=False
+            )
+            log.debug("Request URL: %s", req.url)
+            log.debug("Request Payload: %s", payload)
+            log.debug("Request Response Code: %d", req.status_code)
+
+            if req.status_code == 201 or req.status_code == 200:
+                log.debug("Successfully started search for %d movies", len(movie_ids))
+                return True
+            else:
+                log.error("Failed to start search for %d movies, request response: %d", len(movie_ids),
+                          req.status_code)
+                return False
+        except Exception:
+            log.exception("Exception starting search for %d movies: ", len(movie_ids))
+        return None
@@ -1,7 +1,6 @@
 import os.path
 
 import backoff
-import requests
 from helpers.misc import backoff_handler, dict_merge
 
 from helpers import str as misc_str
@@ -17,12 +16,15 @@ class Sonarr(PVR):
 
     @backoff.on_predicate(backoff.expo, lambda x: x is None, max_tries=4, on_backoff=backoff_handler)
     def get_tags(self):
+        tags = self._get_cached_response('tags')
+        if tags is not None:
+            return tags
+
         tags = {}
         try:
             # make request
-            req = requests.get(
+            req = self.session.get(
                 os.path.join(misc_str.ensure_endswith(self.server_url, "/"), 'api/tag'),
-                headers=self.headers,
                 timeout=60,
                 allow_redirects=False
             )
@@ -34,6 +36,7 @@ class Sonarr(PVR):
                 log.debug("Found Sonarr Tags: %d", len(resp_json))
                 for tag in resp_json:
                     tags[tag['label']] = tag['id']
+                self._set_cached_response('tags', tags)
                 return tags
             else:
                 log.error("Failed to retrieve all tags, request response: %d", req.status_code)
@@ -1,17 +1,21 @@
 import json
+import threading
 import time
 
 import backoff
 import requests
-from cashier import cache
 
 from helpers.misc import backoff_handler, dict_merge
 from helpers.trakt import extract_list_user_and_key_from_url
-from misc.log import logger
+from misc.cache import cache
 from misc.config import Config
+from misc.log import logger
+from misc.shutdown import shutdown_event
 
 log = logger.get_logger(__name__)
 cachefile = Config().cachefile
+# renew expired access tokens one at a time, a refresh token can only be used once
+oauth_token_lock = threading.Lock()
 
 
 class Trakt:
@@ -19,6 +23,7 @@ class Trakt:
 
     def __init__(self, cfg):
         self.cfg = cfg
+        self.session = requests.Session()
 
     ############################################################
     # Requests
@@ -38,12 +43,12 @@ class Trakt:
         # make request
         resp_data = ''
         if request_type == 'delete':
-            with requests.delete(url, headers=headers, params=payload, timeout=30, stream=True) as req:
+            with self.session.delete(url, headers=headers, params=payload, timeout=30, stream=True) as req:
                 for chunk in req.iter_content(chunk_size=250000, decode_unicode=True):
                     if chunk:
                         resp_data += chunk
         else:
-            with requests.get(url, headers=headers, params=payload, timeout=30, stream=True) as req:
+            with self.session.get(url, headers=headers, params=payload, timeout=30, stream=True) as req:
                 for chunk in req.iter_content(chunk_size=250000, decode_unicode=True):
                     if chunk:
                         resp_data += chunk
@@ -128,97 +133,38 @@ class Trakt:
         if runtimes:
             payload['runtimes'] = runtimes
 
+        object_type = object_name.rstrip('s')
         processed = []
+        processed_ids = set()
 
         if authenticate_user:
             type_name = type_name.replace('{authenticate_user}', self._user_used_for_authentication(authenticate_user))
 
         try:
-            resp_data = ''
-            while True:
-                attempts = 0
-                max_attempts = 6
-                retrieve_error = False
-                while attempts <= max_attempts:
-                    try:
-                        req, resp_data = self._make_request(url, payload, authenticate_user)
-                        if resp_data is not None:
-                            retrieve_error = False
-                            break
-                        else:
-                            log.warning("Failed to retrieve valid response for Trakt %s %s from _make_item_request",
-                                        type_name, object_name)
-
-                    except Exception:
-                        log.exception("Exception retrieving %s %s in _make_item_request: ", type_name, object_name)
-                        retrieve_error = True
-
-                    attempts += 1
-                    log.info("Sleeping for %d seconds before making attempt %d/%d", 3 * attempts, attempts + 1,
-                             max_attempts)
-                    time.sleep(3 * attempts)
-
-                if retrieve_error or not resp_data or not len(resp_data):
-                    log.error("Failed retrieving %s %s from _make_item_request %d times, aborting...", type_name,
-                              object_name, attempts)
+            for resp_json in self._iter_pages(url, payload, type_name, object_name, authenticate_user, sleep_between):
+                if resp_json is None:
                     return None
 
-                current_page = payload['page']
-                total_pages = 0 if 'X-Pagination-Page-Count' not in req.headers else int(
-                    req.headers['X-Pagination-Page-Count'])
-
-                log.debug("Response Page: %d of %d", current_page, total_pages)
-
-                if req.status_code == 200 and len(resp_data):
-                    if (resp_data.startswith("[{") and resp_data.endswith("}]")) or \
-                            (resp_data.startswith("{") and resp_data.endswith("}")):
-
-                        resp_json = json.loads(resp_data)
-
-                        if type_name == 'person' and 'cast' in resp_json:
-                            for item in resp_json['cast']:
-                                # filter out non-acting roles
-                                if not include_non_acting_roles and \
-                                        ((item['character'].strip() == '') or
-                                         'narrat' in item['character'].lower() or
-                                         'himself' in item['character'].lower()):
-                                    continue
-                                if item not in processed:
-                                    if object_name.rstrip('s') not in item and 'title' in item:
-                                        processed.append({object_name.rstrip('s'): item})
-                                    else:
-                                        processed.append(item)
-                        else:
-                            for item in resp_json:
-                                if item not in processed:
-                                    if object_name.rstrip('s') not in item and 'title' in item:
-                                        processed.append({object_name.rstrip('s'): item})
-                                    else:
-                                        processed.append(item)
-
-                    elif resp_data == '[]':
-                        log.warning("Received empty JSON response for page: %d of %d", current_page, total_pages)
-                    else:
-                        log.warning("Received malformed JSON response for page: %d of %d", current_page, total_pages)
+                person_cast = type_name == 'person' and 'cast' in resp_json
 
-                    # check if we have fetched the last page, break if so
-                    if total_pages == 0:
-                        log.debug("There were no more pages left to retrieve.")
-                        break
-                    elif current_page >= total_pages:
-                        log.debug("There are no more pages left to retrieve results from.")
-                        break
-                    else:
-                        log.info("There are %d page(s) left to retrieve results from.", total_pages - current_page)
-                        payload['page'] += 1
-                        time.sleep(sleep_between)
+                for item in resp_json['cast'] if person_cast else resp_json:
+                    # filter out non-acting roles
+                    if person_cast and not include_non_acting_roles and \
+                            ((item['character'].strip() == '') or
+                             'narrat' in item['character'].lower() or
+                             'himself' in item['character'].lower()):
+                        continue
+                    if object_type not in item and 'title' in item:
+                        item = {object_type: item}
 
-                elif req.status_code == 401:
-                    log.error("The authentication to Trakt is revoked. Please re-authenticate.")
-                    exit()
-                else:
-                    log.error("Failed to retrieve %s %s, request response: %d", type_name, object_name, req.status_code)
-                    break
+                    # skip items already retrieved (e.g. shifted onto the next page), by their trakt id
+                    trakt_id = ((item.get(object_type) or {}).get('ids') or {}).get('trakt')
+                    if trakt_id is not None:
+                        if trakt_id in processed_ids:
+                            continue
+                        processed_ids.add(trakt_id)
+
+                    processed.append(item)
 
             if len(processed):
                 log.debug("Found %d %s %s", len(processed), type_name, object_name)
@@ -229,6 +175,77 @@ class Trakt:
             log.exception("Exception retrieving %s %s: ", type_name, object_name)
         return None
 
+    def _iter_pages(self, url, payload, type_name, object_name, authenticate_user=None, sleep_between=5):
+        # yield the json of each page as soon as it is retrieved, or None when a page could not be retrieved
+        while True:
+            attempts = 0
+            max_attempts = 6
+            retrieve_error = False
+            resp_data = ''
+            while attempts <= max_attempts:
+                try:
+                    req, resp_data = self._make_request(url, payload, authenticate_user)
+                    if resp_data is not None:
+                        retrieve_error = False
+                        break
+                    else:
+                        log.warning("Failed to retrieve valid response for Trakt %s %s from _make_item_request",
+                                    type_name, object_name)
+
+                except Exception:
+                    log.exception("Exception retrieving %s %s in _make_item_request: ", type_name, object_name)
+                    retrieve_error = True
+
+                attempts += 1
+                log.info("Sleeping for %d seconds before making attempt %d/%d", 3 * attempts, attempts + 1,
+                         max_attempts)
+                if shutdown_event.wait(3 * attempts):
+                    log.info("Stopped retrieving Trakt %s %s because Traktarr is exiting.", type_name, object_name)
+                    return
+
+            if retrieve_error or not resp_data or not len(resp_data):
+                log.error("Failed retrieving %s %s from _make_item_request %d times, aborting...", type_name,
+                          object_name, attempts)
+                yield None
+                return
+
+            current_page = payload['page']
+            total_pages = 0 if 'X-Pagination-Page-Count' not in req.headers else int(
+                req.headers['X-Pagination-Page-Count'])
+
+            log.debug("Response Page: %d of %d", current_page, total_pages)
+
+            if req.status_code == 200 and len(resp_data):
+                if (resp_data.startswith("[{") and resp_data.endswith("}]")) or \
+                        (resp_data.startswith("{") and resp_data.endswith("}")):
+                    yield json.loads(resp_data)
+                elif resp_data == '[]':
+                    log.warning("Received empty JSON response for page: %d of %d", current_page, total_pages)
+                else:
+                    log.warning("Received malformed JSON response for page: %d of %d", current_page, total_pages)
+
+                # check if we have fetched the last page, stop if so
+                if total_pages == 0:
+                    log.debug("There were no more pages left to retrieve.")
+                    return
+                elif current_page >= total_pages:
+                    log.debug("There are no more pages left to retrieve results from.")
+                    return
+                else:
+                    log.info("There are %d page(s) left to retrieve results from.", total_pages - current_page)
+                    payload['page'] += 1
+                    if shutdown_event.wait(sleep_between):
+                        log.info("Stopped retrieving Trakt %s %s because Traktarr is exiting.", type_name,
+                                 object_name)
+                        return
+
+            elif req.status_code == 401:
+                log.error("The authentication to Trakt is revoked. Please re-authenticate.")
+                exit()
+            else:
+                log.error("Failed to retrieve %s %s, request response: %d", type_name, object_name, req.status_code)
+                return
+
     def validate_client_id(self):
         try:
             # request anticipated shows to validate client_id
@@ -265,8 +282,8 @@ class Trakt:
         print(self._headers_without_authentication())
 
         # Request device code
-        req = requests.post('https://api.trakt.tv/oauth/device/code', params=payload,
-                            headers=self._headers_without_authentication())
+        req = self.session.post('https://api.trakt.tv/oauth/device/code', params=payload,
+                                headers=self._headers_without_authentication())
         device_code_response = req.json()
 
         # Display needed information to the user
@@ -288,7 +305,7 @@ class Trakt:
             temp_headers = self._headers_without_authentication()
             temp_headers['Authorization'] = 'Bearer ' + access_token
 
-            req = requests.get('https://api.trakt.tv/users/me', headers=temp_headers)
+            req = self.session.get('https://api.trakt.tv/users/me', headers=temp_headers)
 
             from misc.config import Config
             new_config = Config()
@@ -329,8 +346,8 @@ class Trakt:
                        'client_secret': self.cfg.trakt.client_secret, 'grant_type': 'authorization_code'}
 
             # Poll Trakt for access token
-            req = requests.post('https://api.trakt.tv/oauth/device/token', params=payload,
-                                headers=self._headers_without_authentication())
+            req = self.session.post('https://api.trakt.tv/oauth/device/token', params=payload,
+                                    headers=self._headers_without_authentication())
 
             success, status_code = self.__oauth_process_token_request(req)
 
@@ -347,8 +364,8 @@ class Trakt:
         payload = {'refresh_token': refresh_token, 'client_id': self.cfg.trakt.client_id,
                    'client_secret': self.cfg.trakt.client_secret, 'grant_type': 'refresh_token'}
 
-        req = requests.post('https://api.trakt.tv/oauth/token', params=payload,
-                            headers=self._headers_without_authentication())
+        req = self.session.post('https://api.trakt.tv/oauth/token', params=payload,
+                                headers=self._headers_without_authentication())
 
         success, status_code = self.__oauth_process_token_request(req)
 
@@ -384,16 +401,19 @@ class Trakt:
         return user in self.cfg['trakt'].keys()
 
     def _renew_oauth_token_if_expired(self, user):
-        token_information = self.cfg['trakt'][user]
+        with oauth_token_lock:
+            # use the saved settings, they include a token renewed by another client since the config was loaded
+            token_information = Config().conf['trakt'][user]
 
-        # Check if the access_token for the user is expired
-        expires_at = token_information['created_at'] + token_information['expires_in']
-        if expires_at < round(time.time()):
-            log.info("The access token for the user %s has expired. We're requesting a new one; please wait a moment.",
-                     user)
+            # Check if the access_token for the user is expired
+            expires_at = token_information['created_at'] + token_information['expires_in']
+            if expires_at < round(time.time()):
+                log.info("The access token for the user %s has expired. We're requesting a new one; please wait a "
+                         "moment.", user)
 
-            if self.__oauth_refresh_access_token(token_information["refresh_token"]):
-                log.info("The access token for the user %s has been refreshed. Please restart the application.", user)
+                if self.__oauth_refresh_access_token(token_information["refresh_token"]):
+                    log.info("The access token for the user %s has been refreshed. Please restart the application.",
+                             user)
 
     def _user_used_for_authentication(self, user=None):
         if user is None:
@@ -436,7 +456,7 @@ class Trakt:
             object_name='show',
         )
 
-    @cache(cache_file=cachefile, retry_if_blank=True)
+    @cache(cache_file=cachefile)
     def get_trending_shows(
             self,
             limit=1000,
@@ -459,7 +479,7 @@ class Trakt:
             runtimes=runtimes,
         )
 
-    @cache(cache_file=cachefile, retry_if_blank=True)
+    @cache(cache_file=cachefile)
     def get_popular_shows(
             self,
             limit=1000,
@@ -482,7 +502,7 @@ class Trakt:
             runtimes=runtimes,
         )
 
-    @cache(cache_file=cachefile, retry_if_blank=True)
+    @cache(cache_file=cachefile)
     def get_anticipated_shows(
             self,
             limit=1000,
@@ -530,7 +550,7 @@ class Trakt:
             include_non_acting_roles=include_non_acting_roles,
         )
 
-    @cache(cache_file=cachefile, retry_if_blank=True)
+    @cache(cache_file=cachefile)
     def get_most_played_shows(
             self,
             limit=1000,
@@ -554,7 +574,7 @@ class Trakt:
             runtimes=runtimes,
         )
 
-    @cache(cache_file=cachefile, retry_if_blank=True)
+    @cache(cache_file=cachefile)
     def get_most_watched_shows(
             self,
             limit=1000,
@@ -578,7 +598,7 @@ class Trakt:
             runtimes=runtimes,
         )
 
-    @cache(cache_file=cachefile, retry_if_blank=True)
+    @cache(cache_file=cachefile)
     def get_recommended_shows(
             self,
             authenticate_user=None,
@@ -666,7 +686,7 @@ class Trakt:
             object_name='movie',
         )
 
-    @cache(cache_file=cachefile, retry_if_blank=True)
+    @cache(cache_file=cachefile)
     def get_trending_movies(
             self,
             limit=1000,
@@ -689,7 +709,7 @@ class Trakt:
             runtimes=runtimes,
         )
 
-    @cache(cache_file=cachefile, retry_if_blank=True)
+    @cache(cache_file=cachefile)
     def get_popular_movies(
             self,
             limit=1000,
@@ -712,7 +732,7 @@ class Trakt:
             runtimes=runtimes,
         )
 
-    @cache(cache_file=cachefile, retry_if_blank=True)
+    @cache(cache_file=cachefile)
     def get_anticipated_movies(
             self,
             limit=1000,
@@ -760,7 +780,7 @@ class Trakt:
             include_non_acting_roles=include_non_acting_roles,
         )
 
-    @cache(cache_file=cachefile, retry_if_blank=True)
+    @cache(cache_file=cachefile)
     def get_most_played_movies(
             self,
             limit=1000,
@@ -784,7 +804,7 @@ class Trakt:
             runtimes=runtimes,
         )
 
-    @cache(cache_file=cachefile, retry_if_blank=True)
+    @cache(cache_file=cachefile)
     def get_most_watched_movies(
             self,
             limit=1000,
@@ -808,6 +828,7 @@ class Trakt:
             runtimes=runtimes,
         )
 
+    @cache(cache_file=cachefile)
     def get_boxoffice_movies(
             self,
             limit=1000,
@@ -0,0 +1,40 @@
+import json
+from functools import wraps
+from hashlib import md5
+
+from cashier import Cashier
+
+from misc.log import logger
+
+log = logger.get_logger(__name__)
+
+
+def cache(cache_file, cache_time=60 * 60 * 6, retry_if_blank=True):
+    """
+    Cache method results in a SQLite file, keyed on the method name and its arguments (excluding self)
+
+    :param cache_file: SQLite file to store cached results in
+    :param cache_time: Seconds a cached result remains valid
+    :param retry_if_blank: Do not cache or return blank results
+    :return: Decorator
+    """
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapped(self, *args, **kwargs):
+            key = md5(json.dumps([fn.__name__, args, kwargs], sort_keys=True, default=str).encode('utf8')).hexdigest()
+            store = Cashier(cache_file, cache_time)
+
+            result = store.get(key)
+            if result is not None and (result or not retry_if_blank):
+                log.debug("Using cached result for %s", fn.__name__)
+                return result
+
+            result = fn(self, *args, **kwargs)
+            if result or not retry_if_blank:
+                store.set(key, result)
+            return result
+
+        return wrapped
+
+    return decorator
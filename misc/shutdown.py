@@ -0,0 +1,4 @@
+import threading
+
+# set when traktarr is exiting, so running tasks stop and finish up
+shutdown_event = threading.Event()
@@ -1,7 +1,10 @@
 #!/usr/bin/env python3
+import functools
+import math
 import os.path
 import signal
 import sys
+import threading
 import time
 import re
 
@@ -9,6 +12,8 @@ import click
 import schedule
 from pyfiglet import Figlet
 
+from misc.shutdown import shutdown_event
+
 ############################################################
 # INIT
 ############################################################
@@ -139,7 +144,7 @@ def get_profile_tags(pvr):
 
 
 def get_objects(pvr, pvr_type, notifications):
-    objects_list = pvr.get_objects()
+    objects_list = pvr.get_library()
     objects_type = 'movies' if pvr_type.lower() == 'radarr' else 'shows'
     if not objects_list:
         log.error("Aborting due to failure to retrieve %s list from %s", objects_type, pvr_type)
@@ -353,6 +358,8 @@ def shows(
         authenticate_user=None,
         ignore_blacklist=False,
         remove_rejected_from_recommended=False,
+        trakt=None,
+        sonarr=None,
 ):
 
     from media.sonarr import Sonarr
@@ -423,12 +430,14 @@ def shows(
     if folder:
         cfg['sonarr']['root_folder'] = folder
 
-    # validate trakt client_id
-    trakt = Trakt(cfg)
-    sonarr = Sonarr(cfg.sonarr.url, cfg.sonarr.api_key)
+    # validate trakt client_id, unless already validated by automatic mode
+    if trakt is None:
+        trakt = Trakt(cfg)
+        validate_trakt(trakt, notifications)
 
-    validate_trakt(trakt, notifications)
-    validate_pvr(sonarr, 'Sonarr', notifications)
+    if sonarr is None:
+        sonarr = Sonarr(cfg.sonarr.url, cfg.sonarr.api_key)
+        validate_pvr(sonarr, 'Sonarr', notifications)
 
     # quality profile id
     quality_profile_id = get_quality_profile_id(sonarr, cfg.sonarr.quality)
@@ -438,11 +447,21 @@ def shows(
 
     profile_tags = get_profile_tags(sonarr) if cfg.sonarr.tags else None
 
+    # tags to use for each network, as (tag ids, readable tags)
+    network_tags = {}
+
     pvr_objects_list = get_objects(sonarr, 'Sonarr', notifications)
 
     # get trakt series list
-    if list_type.lower() == 'anticipated':
-        trakt_objects_list = trakt.get_anticipated_shows(
+    trakt_lists = {
+        'anticipated': trakt.get_anticipated_shows,
+        'trending': trakt.get_trending_shows,
+        'popular': trakt.get_popular_shows,
+    }
+
+    list_name = list_type.lower()
+    if list_name in trakt_lists:
+        trakt_objects_list = trakt_lists[list_name](
             years=years,
             countries=countries,
             languages=languages,
@@ -450,25 +469,7 @@ def shows(
             runtimes=runtimes,
         )
 
-    elif list_type.lower() == 'trending':
-        trakt_objects_list = trakt.get_trending_shows(
-            years=years,
-            countries=countries,
-            languages=languages,
-            genres=genres,
-            runtimes=runtimes,
-        )
-
-    elif list_type.lower() == 'popular':
-        trakt_objects_list = trakt.get_popular_shows(
-            years=years,
-            countries=countries,
-            languages=languages,
-            genres=genres,
-            runtimes=runtimes,
-        )
-
-    elif list_type.lower() == 'person':
+    elif list_name == 'person':
         if not actor:
             log.error("You must specify an actor with the \'--actor\' / \'-a\' parameter when using the \'person\'" +
                       " list type!")
@@ -483,7 +484,7 @@ def shows(
             include_non_acting_roles=include_non_acting_roles,
         )
 
-    elif list_type.lower() == 'recommended':
+    elif list_name == 'recommended':
         trakt_objects_list = trakt.get_recommended_shows(
             authenticate_user,
             years=years,
@@ -493,8 +494,8 @@ def shows(
             runtimes=runtimes,
         )
 
-    elif list_type.lower().startswith('played'):
-        most_type = misc_helper.substring_after(list_type.lower(), "_")
+    elif list_name.startswith('played'):
+        most_type = misc_helper.substring_after(list_name, "_")
         trakt_objects_list = trakt.get_most_played_shows(
             years=years,
             countries=countries,
@@ -504,8 +505,8 @@ def shows(
             most_type=most_type if most_type else None,
         )
 
-    elif list_type.lower().startswith('watched'):
-        most_type = misc_helper.substring_after(list_type.lower(), "_")
+    elif list_name.startswith('watched'):
+        most_type = misc_helper.substring_after(list_name, "_")
         trakt_objects_list = trakt.get_most_watched_shows(
             years=years,
             countries=countries,
@@ -515,7 +516,7 @@ def shows(
             most_type=most_type if most_type else None,
         )
 
-    elif list_type.lower() == 'watchlist':
+    elif list_name == 'watchlist':
         trakt_objects_list = trakt.get_watchlist_shows(authenticate_user)
     else:
         trakt_objects_list = trakt.get_user_list_shows(list_type, authenticate_user)
@@ -531,7 +532,7 @@ def shows(
         log.info("Retrieved Trakt \'%s\' shows list, shows found: %d", list_type.capitalize(), len(trakt_objects_list))
 
     # set remove_rejected_recommended to False if this is not the recommended list
-    if list_type.lower() != 'recommended':
+    if list_name != 'recommended':
         remove_rejected_from_recommended = False
 
     # build filtered series list without series that exist in sonarr
@@ -563,25 +564,43 @@ def shows(
         sorted_series_list = misc_helper.sorted_list(processed_series_list, 'show', 'votes')
         log.info("Sorted shows list to process by highest 'votes'.")
 
-    # loop series_list
+    # convert series year to string
+    def get_series_year(trakt_show):
+        if trakt_show['year']:
+            return str(trakt_show['year'])
+        elif trakt_show['first_aired']:
+            return misc_str.get_year_from_timestamp(trakt_show['first_aired'])
+        return '????'
+
+    # check if show has a valid TVDB ID and that it exists on TVDB
+    def check_series_tvdb_id(series):
+        # noinspection PyBroadException
+        try:
+            trakt_show = series['show']
+            return tvdb_helper.check_series_tvdb_id(trakt_show['title'], get_series_year(trakt_show),
+                                                    trakt_show['ids']['tvdb'])
+        except Exception:
+            log.exception("Exception checking TVDB ID for show: %s", series)
+        return False
+
+    blacklist_settings = trakt_helper.compile_blacklist_settings(cfg.filters.shows)
+
+    # loop series_list, looking up TVDB IDs of the next few shows in the background
     log.info("Processing list now...")
-    for series in sorted_series_list:
+    for series, valid_tvdb_id in misc_helper.threaded_lookahead(check_series_tvdb_id, sorted_series_list):
         # noinspection PyBroadException
 
-        # set common series variables
-        series_tvdb_id = series['show']['ids']['tvdb']
-        series_title = series['show']['title']
+        # stop adding shows when traktarr is exiting
+        if shutdown_event.is_set():
+            break
 
-        # convert series year to string
-        if series['show']['year']:
-            series_year = str(series['show']['year'])
-        elif series['show']['first_aired']:
-            series_year = misc_str.get_year_from_timestamp(series['show']['first_aired'])
-        else:
-            series_year = '????'
+        # set common series variables
+        trakt_show = series['show']
+        series_title = trakt_show['title']
+        series_year = get_series_year(trakt_show)
 
         # series type
-        if any('anime' in s.lower() for s in series['show']['genres']):
+        if any('anime' in s.lower() for s in trakt_show['genres']):
             series_type = 'anime'
         else:
             series_type = 'standard'
@@ -589,11 +608,11 @@ def shows(
         log.debug("Set series type for \'%s (%s)\' to: %s", series_title, series_year, series_type.title())
 
         # build list of genres
-        series_genres = (', '.join(series['show']['genres'])).title() if series['show']['genres'] else 'N/A'
+        series_genres = (', '.join(trakt_show['genres'])).title() if trakt_show['genres'] else 'N/A'
 
         try:
-            # check if movie has a valid TVDB ID and that it exists on TVDB
-            if not tvdb_helper.check_series_tvdb_id(series_title, series_year, series_tvdb_id):
+            # skip show if it does not have a valid TVDB ID
+            if not valid_tvdb_id:
                 continue
 
             # check if genres matches genre(s) supplied via argument
@@ -603,77 +622,79 @@ def shows(
                 continue
 
             # check if series passes out blacklist criteria inspection
-            if not trakt_helper.is_show_blacklisted(
+            if trakt_helper.is_show_blacklisted(
                     series,
-                    cfg.filters.shows,
+                    blacklist_settings,
                     ignore_blacklist,
                     callback_remove_recommended if remove_rejected_from_recommended else None,
             ):
+                log.info("SKIPPED: \'%s (%s)\'", series_title, series_year)
+                continue
 
-                log.info("ADDING: %s (%s) | Country: %s | Language: %s | Genre(s): %s | Network: %s",
-                         series_title,
-                         series_year,
-                         (series['show']['country'] or 'N/A').upper(),
-                         (series['show']['language'] or 'N/A').upper(),
-                         series_genres,
-                         (series['show']['network'] or 'N/A').upper(),
-                         )
-
-                # profile tags
-                use_tags = None
-                readable_tags = None
-
-                if profile_tags is not None:
-                    # determine which tags to use when adding this series
-                    use_tags = sonarr_helper.series_tag_id_from_network(
+            log.info("ADDING: %s (%s) | Country: %s | Language: %s | Genre(s): %s | Network: %s",
+                     series_title,
+                     series_year,
+                     (trakt_show['country'] or 'N/A').upper(),
+                     (trakt_show['language'] or 'N/A').upper(),
+                     series_genres,
+                     (trakt_show['network'] or 'N/A').upper(),
+                     )
+
+            # profile tags
+            use_tags = None
+            readable_tags = None
+
+            if profile_tags is not None:
+                # determine which tags to use when adding this series, once per network
+                network = trakt_show['network']
+                if network not in network_tags:
+                    network_tag_ids = sonarr_helper.series_tag_id_from_network(
                         profile_tags,
                         cfg.sonarr.tags,
-                        series['show']['network'],
+                        network,
                     )
-                    readable_tags = sonarr_helper.readable_tag_from_ids(
-                        profile_tags,
-                        use_tags,
+                    network_tags[network] = (
+                        network_tag_ids,
+                        sonarr_helper.readable_tag_from_ids(profile_tags, network_tag_ids),
                     )
+                use_tags, readable_tags = network_tags[network]
+
+            # add show to sonarr
+            if sonarr.add_series(
+                    trakt_show['ids']['tvdb'],
+                    series_title,
+                    trakt_show['ids']['slug'],
+                    quality_profile_id,
+                    language_profile_id,
+                    cfg.sonarr.root_folder,
+                    use_tags,
+                    not no_search,
+                    series_type,
+            ):
 
-                # add show to sonarr
-                if sonarr.add_series(
-                        series['show']['ids']['tvdb'],
-                        series_title,
-                        series['show']['ids']['slug'],
-                        quality_profile_id,
-                        language_profile_id,
-                        cfg.sonarr.root_folder,
-                        use_tags,
-                        not no_search,
-                        series_type,
-                ):
-
-                    if profile_tags is not None and readable_tags is not None:
-                        log.info("ADDED: \'%s (%s)\' with Sonarr Tags: %s", series_title, series_year,
-                                 readable_tags)
-                    else:
-                        log.info("ADDED: \'%s (%s)\'", series_title, series_year)
-                    if notifications:
-                        callback_notify({'event': 'add_show', 'list_type': list_type, 'show': series['show']})
-                    added_shows += 1
+                if profile_tags is not None and readable_tags is not None:
+                    log.info("ADDED: \'%s (%s)\' with Sonarr Tags: %s", series_title, series_year,
+                             readable_tags)
                 else:
-                    if profile_tags is not None:
-                        log.error("FAILED ADDING: \'%s (%s)\' with Sonarr Tags: %s", series_title, series_year,
-                                  readable_tags)
-                    else:
-                        log.info("FAILED ADDING: \'%s (%s)\'", series_title, series_year)
-                    continue
-
+                    log.info("ADDED: \'%s (%s)\'", series_title, series_year)
+                if notifications:
+                    callback_notify({'event': 'add_show', 'list_type': list_type, 'show': trakt_show})
+                added_shows += 1
             else:
-                log.info("SKIPPED: \'%s (%s)\'", series_title, series_year)
+                if profile_tags is not None:
+                    log.error("FAILED ADDING: \'%s (%s)\' with Sonarr Tags: %s", series_title, series_year,
+                              readable_tags)
+                else:
+                    log.info("FAILED ADDING: \'%s (%s)\'", series_title, series_year)
                 continue
 
             # stop adding shows, if added_shows >= add_limit
             if add_limit and added_shows >= add_limit:
                 break
 
-            # sleep before adding any more
-            time.sleep(add_delay)
+            # sleep before adding any more, stop adding when traktarr is exiting
+            if shutdown_event.wait(add_delay):
+                break
 
         except Exception:
             log.exception("Exception while processing show \'%s\': ", series_title)
@@ -866,6 +887,8 @@ def movies(
         authenticate_user=None,
         ignore_blacklist=False,
         remove_rejected_from_recommended=False,
+        trakt=None,
+        radarr=None,
 ):
 
     from media.radarr import Radarr
@@ -877,6 +900,7 @@ def movies(
     from helpers import tmdb as tmdb_helper
 
     added_movies = 0
+    added_movie_ids = []
 
     # process countries
     if not cfg.filters.movies.allowed_countries or 'ignore' in cfg.filters.movies.allowed_countries:
@@ -948,12 +972,14 @@ def movies(
 
     log.debug('Set minimum availability to: \'%s\'', cfg['radarr']['minimum_availability'])
 
-    # validate trakt api_key
-    trakt = Trakt(cfg)
-    radarr = Radarr(cfg.radarr.url, cfg.radarr.api_key)
+    # validate trakt api_key, unless already validated by automatic mode
+    if trakt is None:
+        trakt = Trakt(cfg)
+        validate_trakt(trakt, notifications)
 
-    validate_trakt(trakt, notifications)
-    validate_pvr(radarr, 'Radarr', notifications)
+    if radarr is None:
+        radarr = Radarr(cfg.radarr.url, cfg.radarr.api_key)
+        validate_pvr(radarr, 'Radarr', notifications)
 
     # quality profile id
     quality_profile_id = get_quality_profile_id(radarr, cfg.radarr.quality)
@@ -962,26 +988,15 @@ def movies(
     pvr_exclusions_list = get_exclusions(radarr, 'Radarr', notifications)
 
     # get trakt movies list
-    if list_type.lower() == 'anticipated':
-        trakt_objects_list = trakt.get_anticipated_movies(
-            years=years,
-            countries=countries,
-            languages=languages,
-            genres=genres,
-            runtimes=runtimes,
-        )
-
-    elif list_type.lower() == 'trending':
-        trakt_objects_list = trakt.get_trending_movies(
-            years=years,
-            countries=countries,
-            languages=languages,
-            genres=genres,
-            runtimes=runtimes,
-        )
-
-    elif list_type.lower() == 'popular':
-        trakt_objects_list = trakt.get_popular_movies(
+    trakt_lists = {
+        'anticipated': trakt.get_anticipated_movies,
+        'trending': trakt.get_trending_movies,
+        'popular': trakt.get_popular_movies,
+    }
+
+    list_name = list_type.lower()
+    if list_name in trakt_lists:
+        trakt_objects_list = trakt_lists[list_name](
             years=years,
             countries=countries,
             languages=languages,
@@ -989,10 +1004,10 @@ def movies(
             runtimes=runtimes,
         )
 
-    elif list_type.lower() == 'boxoffice':
+    elif list_name == 'boxoffice':
         trakt_objects_list = trakt.get_boxoffice_movies()
 
-    elif list_type.lower() == 'person':
+    elif list_name == 'person':
         if not actor:
             log.error("You must specify an actor with the \'--actor\' / \'-a\' parameter when using the \'person\'" +
                       " list type!")
@@ -1007,7 +1022,7 @@ def movies(
             include_non_acting_roles=include_non_acting_roles,
         )
 
-    elif list_type.lower() == 'recommended':
+    elif list_name == 'recommended':
         trakt_objects_list = trakt.get_recommended_movies(
             authenticate_user,
             years=years,
@@ -1017,8 +1032,8 @@ def movies(
             runtimes=runtimes,
         )
 
-    elif list_type.lower().startswith('played'):
-        most_type = misc_helper.substring_after(list_type.lower(), "_")
+    elif list_name.startswith('played'):
+        most_type = misc_helper.substring_after(list_name, "_")
         trakt_objects_list = trakt.get_most_played_movies(
             years=years,
             countries=countries,
@@ -1028,8 +1043,8 @@ def movies(
             most_type=most_type if most_type else None,
         )
 
-    elif list_type.lower().startswith('watched'):
-        most_type = misc_helper.substring_after(list_type.lower(), "_")
+    elif list_name.startswith('watched'):
+        most_type = misc_helper.substring_after(list_name, "_")
         trakt_objects_list = trakt.get_most_watched_movies(
             years=years,
             countries=countries,
@@ -1039,7 +1054,7 @@ def movies(
             most_type=most_type if most_type else None,
         )
 
-    elif list_type.lower() == 'watchlist':
+    elif list_name == 'watchlist':
         trakt_objects_list = trakt.get_watchlist_movies(authenticate_user)
     else:
         trakt_objects_list = trakt.get_user_list_movies(list_type, authenticate_user)
@@ -1056,7 +1071,7 @@ def movies(
                  len(trakt_objects_list))
 
     # set remove_rejected_recommended to False if this is not the recommended list
-    if list_type.lower() != 'recommended':
+    if list_name != 'recommended':
         remove_rejected_from_recommended = False
 
     # build filtered movie list without movies that exist in radarr
@@ -1098,42 +1113,60 @@ def movies(
         else:
             log.info("Skipping minimum Rotten Tomatoes score check as OMDb API Key is missing.")
 
-    # loop movies
-    log.info("Processing list now...")
-    for sorted_movie in sorted_movies_list:
+    # check if movie has a valid TMDb ID and that it exists on TMDb
+    def check_movie_tmdb_id(movie):
         # noinspection PyBroadException
+        try:
+            trakt_movie = movie['movie']
+            year = str(trakt_movie['year']) if trakt_movie['year'] else '????'
+            return tmdb_helper.check_movie_tmdb_id(trakt_movie['title'], year, trakt_movie['ids']['tmdb'])
+        except Exception:
+            log.exception("Exception checking TMDb ID for movie: %s", movie)
+        return False
 
-        # set common series variables
-        movie_title = sorted_movie['movie']['title']
-        movie_tmdb_id = sorted_movie['movie']['ids']['tmdb']
-        movie_imdb_id = sorted_movie['movie']['ids']['imdb']
+    blacklist_settings = trakt_helper.compile_blacklist_settings(cfg.filters.movies)
 
-        # convert movie year to string
-        movie_year = str(sorted_movie['movie']['year']) \
-            if sorted_movie['movie']['year'] else '????'
+    # loop movies, looking up TMDb IDs of the next few movies in the background
+    log.info("Processing list now...")
+    try:
+        for sorted_movie, valid_tmdb_id in misc_helper.threaded_lookahead(check_movie_tmdb_id, sorted_movies_list):
+            # noinspection PyBroadException
 
-        # build list of genres
-        movie_genres = (', '.join(sorted_movie['movie']['genres'])).title() \
-            if sorted_movie['movie']['genres'] else 'N/A'
+            # stop adding movies when traktarr is exiting
+            if shutdown_event.is_set():
+                break
 
-        try:
-            # check if movie has a valid TMDb ID and that it exists on TMDb
-            if not tmdb_helper.check_movie_tmdb_id(movie_title, movie_year, movie_tmdb_id):
-                continue
+            # set common movie variables
+            trakt_movie = sorted_movie['movie']
+            movie_title = trakt_movie['title']
+            movie_imdb_id = trakt_movie['ids']['imdb']
 
-            # check if genres matches genre(s) supplied via argument
-            if genres and not misc_helper.allowed_genres(genres, 'movie', sorted_movie):
-                log.debug("SKIPPING: \'%s (%s)\' because it was not from the genre(s): %s", movie_title,
-                          movie_year, ', '.join(map(lambda x: x.title(), genres)))
-                continue
+            # convert movie year to string
+            movie_year = str(trakt_movie['year']) if trakt_movie['year'] else '????'
 
-            # check if movie passes out blacklist criteria inspection
-            if not trakt_helper.is_movie_blacklisted(
-                    sorted_movie,
-                    cfg.filters.movies,
-                    ignore_blacklist,
-                    callback_remove_recommended if remove_rejected_from_recommended else None,
-            ):
+            # build list of genres
+            movie_genres = (', '.join(trakt_movie['genres'])).title() if trakt_movie['genres'] else 'N/A'
+
+            try:
+                # skip movie if it does not have a valid TMDb ID
+                if not valid_tmdb_id:
+                    continue
+
+                # check if genres matches genre(s) supplied via argument
+                if genres and not misc_helper.allowed_genres(genres, 'movie', sorted_movie):
+                    log.debug("SKIPPING: \'%s (%s)\' because it was not from the genre(s): %s", movie_title,
+                              movie_year, ', '.join(map(lambda x: x.title(), genres)))
+                    continue
+
+                # check if movie passes out blacklist criteria inspection
+                if trakt_helper.is_movie_blacklisted(
+                        sorted_movie,
+                        blacklist_settings,
+                        ignore_blacklist,
+                        callback_remove_recommended if remove_rejected_from_recommended else None,
+                ):
+                    log.info("SKIPPED: \'%s (%s)\'", movie_title, movie_year)
+                    continue
 
                 # Skip movie if below user specified min RT score
                 if rotten_tomatoes is not None and cfg.omdb.api_key:
@@ -1149,43 +1182,51 @@ def movies(
                 log.info("ADDING: \'%s (%s)\' | Country: %s | Language: %s | Genre(s): %s ",
                          movie_title,
                          movie_year,
-                         (sorted_movie['movie']['country'] or 'N/A').upper(),
-                         (sorted_movie['movie']['language'] or 'N/A').upper(),
+                         (trakt_movie['country'] or 'N/A').upper(),
+                         (trakt_movie['language'] or 'N/A').upper(),
                          movie_genres,
                          )
 
-                # add movie to radarr
-                if radarr.add_movie(
-                        sorted_movie['movie']['ids']['tmdb'],
-                        movie_title,
-                        movie_year,
-                        sorted_movie['movie']['ids']['slug'],
-                        quality_profile_id,
-                        cfg.radarr.root_folder,
-                        cfg.radarr.minimum_availability,
-                        not no_search,
-                ):
+                # add movie to radarr, searching for it later with the other added movies
+                added_movie = radarr.add_movie(
+                    trakt_movie['ids']['tmdb'],
+                    movie_title,
+                    movie_year,
+                    trakt_movie['ids']['slug'],
+                    quality_profile_id,
+                    cfg.radarr.root_folder,
+                    cfg.radarr.minimum_availability,
+                    False,
+                )
 
+                if added_movie:
                     log.info("ADDED: \'%s (%s)\'", movie_title, movie_year)
                     if notifications:
-                        callback_notify({'event': 'add_movie', 'list_type': list_type, 'movie': sorted_movie['movie']})
+                        callback_notify({'event': 'add_movie', 'list_type': list_type, 'movie': trakt_movie})
                     added_movies += 1
+                    if 'id' in added_movie:
+                        added_movie_ids.append(added_movie['id'])
                 else:
                     log.error("FAILED ADDING: \'%s (%s)\'", movie_title, movie_year)
                     continue
-            else:
-                log.info("SKIPPED: \'%s (%s)\'", movie_title, movie_year)
-                continue
-
-            # stop adding movies, if added_movies >= add_limit
-            if add_limit and added_movies >= add_limit:
-                break
 
-            # sleep before adding any more
-            time.sleep(add_delay)
-
-        except Exception:
-            log.exception("Exception while processing movie \'%s\': ", movie_title)
+                # stop adding movies, if added_movies >= add_limit
+                if add_limit and added_movies >= add_limit:
+                    break
+
+                # sleep before adding any more, stop adding when traktarr is exiting
+                if shutdown_event.wait(add_delay):
+                    break
+
+            except Exception:
+                log.exception("Exception while processing movie \'%s\': ", movie_title)
+    finally:
+        # search for all added movies with a single command, also when adding was interrupted
+        if added_movie_ids and not no_search:
+            if radarr.search_movies(added_movie_ids):
+                log.info("Started Radarr search for %d added movie(s)", len(added_movie_ids))
+            else:
+                log.error("FAILED starting Radarr search for %d added movie(s)", len(added_movie_ids))
 
     log.info("Added %d new movie(s) to Radarr", added_movies)
 
@@ -1270,6 +1311,8 @@ def automatic_shows(
         no_search=False,
         notifications=False,
         ignore_blacklist=False,
+        trakt=None,
+        sonarr=None,
 ):
 
     from media.trakt import Trakt
@@ -1284,6 +1327,10 @@ def automatic_shows(
             notify.send(message="Automatic Shows task started.")
 
         for list_type, value in cfg.automatic.shows.items():
+            # stop processing lists when traktarr is exiting
+            if shutdown_event.is_set():
+                break
+
             added_shows = None
 
             if list_type.lower() == 'interval':
@@ -1313,10 +1360,15 @@ def automatic_shows(
                     no_search=no_search,
                     notifications=notifications,
                     ignore_blacklist=local_ignore_blacklist,
+                    trakt=trakt,
+                    sonarr=sonarr,
                 )
 
             elif list_type.lower() == 'watchlist':
                 for authenticate_user, limit in value.items():
+                    if shutdown_event.is_set():
+                        break
+
                     if limit <= 0:
                         log.info("SKIPPED Trakt user \'%s\''s \'%s\'", authenticate_user, list_type.capitalize)
                         continue
@@ -1339,6 +1391,8 @@ def automatic_shows(
                         notifications=notifications,
                         authenticate_user=authenticate_user,
                         ignore_blacklist=local_ignore_blacklist,
+                        trakt=trakt,
+                        sonarr=sonarr,
                     )
 
             elif list_type.lower() == 'lists':
@@ -1348,6 +1402,9 @@ def automatic_shows(
                     continue
 
                 for list_, v in value.items():
+                    if shutdown_event.is_set():
+                        break
+
                     if isinstance(v, dict):
                         authenticate_user = v['authenticate_user']
                         limit = v['limit']
@@ -1374,17 +1431,19 @@ def automatic_shows(
                         notifications=notifications,
                         authenticate_user=authenticate_user,
                         ignore_blacklist=local_ignore_blacklist,
+                        trakt=trakt,
+                        sonarr=sonarr,
                     )
 
             if added_shows is None:
                 if not list_type.lower() == 'lists':
                     log.info("FAILED ADDING shows from Trakt's \'%s\' list.", list_type)
-                time.sleep(10)
-                continue
-            total_shows_added += added_shows
+            else:
+                total_shows_added += added_shows
 
-            # sleep
-            time.sleep(10)
+            # sleep, stop processing lists when traktarr is exiting
+            if shutdown_event.wait(10):
+                break
 
         log.info("FINISHED: Added %d show(s) total to Sonarr!", total_shows_added)
         # send notification
@@ -1403,6 +1462,8 @@ def automatic_movies(
         notifications=False,
         ignore_blacklist=False,
         rotten_tomatoes=None,
+        trakt=None,
+        radarr=None,
 ):
 
     from media.trakt import Trakt
@@ -1417,6 +1478,10 @@ def automatic_movies(
             notify.send(message="Automatic Movies task started.")
 
         for list_type, value in cfg.automatic.movies.items():
+            # stop processing lists when traktarr is exiting
+            if shutdown_event.is_set():
+                break
+
             added_movies = None
 
             if list_type.lower() == 'interval':
@@ -1447,10 +1512,15 @@ def automatic_movies(
                     notifications=notifications,
                     ignore_blacklist=local_ignore_blacklist,
                     rotten_tomatoes=rotten_tomatoes,
+                    trakt=trakt,
+                    radarr=radarr,
                 )
 
             elif list_type.lower() == 'watchlist':
                 for authenticate_user, limit in value.items():
+                    if shutdown_event.is_set():
+                        break
+
                     if limit <= 0:
                         log.info("SKIPPED Trakt user \'%s\''s \'%s\'", authenticate_user, list_type.capitalize)
                         continue
@@ -1474,6 +1544,8 @@ def automatic_movies(
                         authenticate_user=authenticate_user,
                         ignore_blacklist=local_ignore_blacklist,
                         rotten_tomatoes=rotten_tomatoes,
+                        trakt=trakt,
+                        radarr=radarr,
                     )
 
             elif list_type.lower() == 'lists':
@@ -1483,6 +1555,9 @@ def automatic_movies(
                     continue
 
                 for list_, v in value.items():
+                    if shutdown_event.is_set():
+                        break
+
                     if isinstance(v, dict):
                         authenticate_user = v['authenticate_user']
                         limit = v['limit']
@@ -1510,17 +1585,19 @@ def automatic_movies(
                         authenticate_user=authenticate_user,
                         ignore_blacklist=local_ignore_blacklist,
                         rotten_tomatoes=rotten_tomatoes,
+                        trakt=trakt,
+                        radarr=radarr,
                     )
 
             if added_movies is None:
                 if not list_type.lower() == 'lists':
                     log.info("FAILED ADDING movies from Trakt's \'%s\' list.", list_type.capitalize())
-                time.sleep(10)
-                continue
-            total_movies_added += added_movies
+            else:
+                total_movies_added += added_movies
 
-            # sleep
-            time.sleep(10)
+            # sleep, stop processing lists when traktarr is exiting
+            if shutdown_event.wait(10):
+                break
 
         log.info("FINISHED: Added %d movie(s) total to Radarr!", total_movies_added)
         # send notification
@@ -1532,6 +1609,33 @@ def automatic_movies(
     return
 
 
+def threaded_job(job_func):
+    # run a scheduled job in its own thread, so a long running task does not hold up the other tasks
+    job_thread = None
+
+    def run_job_thread(*args, **kwargs):
+        try:
+            job_func(*args, **kwargs)
+        except SystemExit:
+            # the task hit a failure that exits traktarr, so stop automatic mode rather than only ending this
+            # thread (exit_handler runs in the main thread, where it can end the process)
+            log.error("Stopping automatic mode because %s exited.", job_func.__name__)
+            os.kill(os.getpid(), signal.SIGTERM)
+
+    @functools.wraps(job_func)
+    def run_job(*args, **kwargs):
+        nonlocal job_thread
+
+        if job_thread is not None and job_thread.is_alive():
+            log.info("SKIPPED starting %s as its previous run has not finished yet.", job_func.__name__)
+            return
+
+        job_thread = threading.Thread(target=run_job_thread, args=args, kwargs=kwargs)
+        job_thread.start()
+
+    return run_job
+
+
 @app.command(help='Run Traktarr in automatic mode.')
 @click.option(
     '--add-delay', '-d',
@@ -1569,22 +1673,34 @@ def run(
         ignore_blacklist=False,
 ):
 
+    from media.radarr import Radarr
+    from media.sonarr import Sonarr
+    from media.trakt import Trakt
+
     log.info("Automatic mode is now running.")
 
     # send notification
     if not no_notifications and cfg.notifications.verbose:
         notify.send(message="Automatic mode is now running.")
 
+    # validate trakt client_id once, each scheduled task gets its own client as the tasks can run at the same time
+    validate_trakt(Trakt(cfg), not no_notifications)
+
     # Add tasks to schedule and do first run if enabled
     if cfg.automatic.movies.interval and cfg.automatic.movies.interval > 0:
+        radarr = Radarr(cfg.radarr.url, cfg.radarr.api_key)
+        validate_pvr(radarr, 'Radarr', not no_notifications)
+
         movie_schedule = schedule.every(cfg.automatic.movies.interval).hours.do(
-            automatic_movies,
+            threaded_job(automatic_movies),
             add_delay,
             sort,
             no_search,
             not no_notifications,
             ignore_blacklist,
             int(cfg.filters.movies.rotten_tomatoes) if cfg.filters.movies.rotten_tomatoes != "" else None,
+            trakt=Trakt(cfg),
+            radarr=radarr,
         )
         if run_now:
             movie_schedule.run()
@@ -1593,13 +1709,18 @@ def run(
             time.sleep(add_delay)
 
     if cfg.automatic.shows.interval and cfg.automatic.shows.interval > 0:
+        sonarr = Sonarr(cfg.sonarr.url, cfg.sonarr.api_key)
+        validate_pvr(sonarr, 'Sonarr', not no_notifications)
+
         shows_schedule = schedule.every(cfg.automatic.shows.interval).hours.do(
-            automatic_shows,
+            threaded_job(automatic_shows),
             add_delay,
             sort,
             no_search,
             not no_notifications,
-            ignore_blacklist
+            ignore_blacklist,
+            trakt=Trakt(cfg),
+            sonarr=sonarr,
         )
         if run_now:
             shows_schedule.run()
@@ -1607,12 +1728,16 @@ def run(
             # Sleep between tasks
             time.sleep(add_delay)
 
+    if not schedule.jobs:
+        log.info("No tasks to schedule, set an interval for shows and/or movies in the config.")
+        return
+
     # Enter running schedule
     while True:
         try:
-            # Sleep until next run
+            # Sleep until next run, rounded up so a slightly early wakeup does not spin the loop
             log.info("Next job at %s", schedule.next_run())
-            time.sleep(max(schedule.idle_seconds(), 0))
+            time.sleep(max(math.ceil(schedule.idle_seconds()), 0))
             # Check jobs to run
             schedule.run_pending()
 
@@ -1642,6 +1767,7 @@ def init_notifications():
 # noinspection PyUnusedLocal
 def exit_handler(signum, frame):
     log.info("Received %s, canceling jobs and exiting.", signal.Signals(signum).name)
+    shutdown_event.set()
     schedule.clear()
     exit()
 